@@ -0,0 +1,36 @@
+from fastapi import Request
+
+from services.extraction_chain import (
+    ExtractionChain,
+    get_extraction_chain as build_extraction_chain,
+)
+from services.validation_agent import (
+    ValidationAgent,
+    get_validation_agent as build_validation_agent,
+)
+
+
+def get_extraction_chain(request: Request) -> ExtractionChain:
+    """Dependency for the app-lifetime extraction chain.
+
+    Normally built at startup; when startup construction failed (e.g.
+    unconfigured LLM) this retries lazily so only LLM endpoints error
+    while the rest of the API keeps serving.
+    """
+    chain = getattr(request.app.state, "extraction_chain", None)
+    if chain is None:
+        chain = build_extraction_chain()
+        request.app.state.extraction_chain = chain
+    return chain
+
+
+def get_validation_agent(request: Request) -> ValidationAgent:
+    """Dependency for the app-lifetime validation agent.
+
+    Same lazy fallback as get_extraction_chain.
+    """
+    agent = getattr(request.app.state, "validation_agent", None)
+    if agent is None:
+        agent = build_validation_agent()
+        request.app.state.validation_agent = agent
+    return agent
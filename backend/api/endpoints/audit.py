@@ -1,24 +1,33 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Depends
 from sqlalchemy.orm import Session
 from datetime import datetime
+import aiofiles
+import hashlib
+import os
 import time
-import uuid
 
+from api import deps
 from db.session import get_db
 from models.contract import Contract
+from services import llm_cache
 from services.pdf_extractor import PDFExtractor
 from services.extraction_chain import ExtractionChain
-from services.validation_agent import ValidationAgent
+from services.validation_agent import ValidationAgent, ValidationResult
 from api.schemas.contract import AuditResponse, ExtractedDataSchema, ValidationIssue
-from core.constants import ContractStatus
+from core.config import settings
+from core.ids import uuid7_str
+from core.constants import ContractStatus, PROMPT_VERSION
 
 router = APIRouter()
 
 
 @router.post("/audit", response_model=AuditResponse)
 async def audit_contract(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    extraction_chain: ExtractionChain = Depends(deps.get_extraction_chain),
+    validation_agent: ValidationAgent = Depends(deps.get_validation_agent)
 ):
     """
     Audit a contract PDF.
@@ -31,30 +40,83 @@ async def audit_contract(
     5. Persist results
     6. Return audit response
     """
-    start_time = time.time()
-
-    # 1. Validate file type
-    if not file.filename.lower().endswith('.pdf'):
+    start_time = time.perf_counter_ns()
+
+    # Stream the upload straight to disk in chunks: the PDF lives on the
+    # filesystem and the contracts row only stores its path, so hashing and
+    # sizing incrementally keeps memory flat regardless of PDF size.
+    # 1. The first bytes must be the PDF magic number — a filename ending in
+    # .pdf proves nothing, and failing here costs microseconds instead of a
+    # full extraction attempt seconds later.
+    os.makedirs(settings.PDF_STORAGE_DIR, exist_ok=True)
+    contract_id = uuid7_str()
+    pdf_path = os.path.join(settings.PDF_STORAGE_DIR, f"{contract_id}.pdf")
+
+    hasher = hashlib.sha256()
+    file_size = 0
+    try:
+        async with aiofiles.open(pdf_path, "wb") as pdf_out:
+            while True:
+                chunk = await file.read(1024 * 1024)
+                if not chunk:
+                    break
+                if file_size == 0 and not chunk.startswith(b"%PDF-"):
+                    raise HTTPException(
+                        status_code=400,
+                        detail="File is not a valid PDF"
+                    )
+                file_size += len(chunk)
+                if file_size > settings.MAX_PDF_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"PDF exceeds the {settings.MAX_PDF_BYTES} byte limit"
+                    )
+                hasher.update(chunk)
+                await pdf_out.write(chunk)
+    except HTTPException:
+        os.remove(pdf_path)
+        raise
+
+    if file_size == 0:
+        os.remove(pdf_path)
         raise HTTPException(
             status_code=400,
-            detail="Only PDF files are accepted"
+            detail="Empty file uploaded"
         )
 
-    # Read file content
-    content = await file.read()
+    content_sha256 = hasher.hexdigest()
 
-    if len(content) == 0:
-        raise HTTPException(
-            status_code=400,
-            detail="Empty file uploaded"
+    # Dedupe: an already-audited upload of the same bytes can be answered
+    # from its existing row without touching the LLM
+    existing = db.query(Contract).filter(
+        Contract.content_sha256 == content_sha256,
+        Contract.status == ContractStatus.APPROVED.value
+    ).first()
+
+    if existing is not None:
+        # Discard the duplicate file after the response goes out
+        background_tasks.add_task(os.remove, pdf_path)
+        return AuditResponse(
+            id=existing.id,
+            status=ContractStatus(existing.status),
+            extracted_data=ExtractedDataSchema.model_construct(**(existing.extracted_data or {})),
+            validation_issues=[
+                ValidationIssue.model_construct(**issue)
+                for issue in (existing.validation_issues or [])
+            ],
+            requires_human_review=existing.requires_human_review,
+            review_reasons=existing.review_reasons or [],
+            confidence_score=existing.confidence_score or 0.0,
+            processing_time_ms=(time.perf_counter_ns() - start_time) // 1_000_000
         )
 
-    # 2. Create initial contract record with PDF content
+    # 2. Create initial contract record pointing at the stored PDF
     contract = Contract(
-        id=str(uuid.uuid4()),
+        id=contract_id,
         file_name=file.filename,
-        file_size=len(content),
-        pdf_content=content,  # Store original PDF
+        file_size=file_size,
+        pdf_path=pdf_path,
+        content_sha256=content_sha256,
         file_mime_type="application/pdf",
         status=ContractStatus.PROCESSING.value
     )
@@ -62,25 +124,49 @@ async def audit_contract(
     db.commit()
 
     try:
-        # 3. Extract text from PDF
+        # 3. Extract text from PDF (pass the spooled file so the parser
+        # reads lazily instead of copying the bytes into a BytesIO; the
+        # upload hash keys the parse cache for re-submitted content)
         pdf_extractor = PDFExtractor()
-        raw_text = pdf_extractor.extract_text(content)
+        raw_text = pdf_extractor.extract_text(
+            file.file, cache_key=content_sha256
+        )
         contract.raw_text = raw_text
 
         if not raw_text.strip():
             raise ValueError("Could not extract any text from PDF")
 
-        # 4. Extract structured data with LLM
-        extraction_chain = ExtractionChain()
-        extracted_data, confidence_score = await extraction_chain.extract(raw_text)
+        # 4+5. Extract structured data with LLM and validate with business
+        # rules, short-circuiting both via the content-addressable cache
+        cache_key = (
+            settings.GEMINI_MODEL,
+            PROMPT_VERSION,
+            hasher.hexdigest()
+        )
+        cached = llm_cache.get(db, cache_key)
+
+        if cached is not None:
+            extracted_data = ExtractedDataSchema.model_validate(cached["extracted_data"])
+            confidence_score = cached["confidence"]
+            validation_result = ValidationResult.model_validate(cached["validation"])
+        else:
+            extracted_data, confidence_score = await extraction_chain.extract(raw_text)
+            validation_result = await validation_agent.validate(extracted_data)
+
+            # Zero confidence marks a failed extraction; never persist
+            # that for the cache TTL as if it were a real result
+            if confidence_score > 0:
+                llm_cache.set(
+                    db,
+                    cache_key,
+                    extracted_data=extracted_data.model_dump(),
+                    confidence=confidence_score,
+                    validation=validation_result.model_dump()
+                )
 
         contract.extracted_data = extracted_data.model_dump()
         contract.confidence_score = confidence_score
 
-        # 5. Validate with business rules
-        validation_agent = ValidationAgent()
-        validation_result = await validation_agent.validate(extracted_data)
-
         contract.validation_issues = [
             issue.model_dump() for issue in validation_result.issues
         ]
@@ -94,10 +180,9 @@ async def audit_contract(
             contract.status = ContractStatus.APPROVED.value
 
         contract.processed_at = datetime.utcnow()
-        contract.processing_time_ms = int((time.time() - start_time) * 1000)
+        contract.processing_time_ms = (time.perf_counter_ns() - start_time) // 1_000_000
 
         db.commit()
-        db.refresh(contract)
 
         return AuditResponse(
             id=contract.id,
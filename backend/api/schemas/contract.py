@@ -65,10 +65,14 @@ class ContractResponse(BaseModel):
 
 
 class ContractListResponse(BaseModel):
-    """Response for list of contracts."""
+    """Response for a page of contracts."""
 
     contracts: List[ContractResponse]
     total: int
+    next_offset: Optional[int] = Field(
+        None,
+        description="Offset of the next page, or null if this is the last page"
+    )
 
 
 class ContractUpdateRequest(BaseModel):
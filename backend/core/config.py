@@ -11,11 +11,21 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./contracts.db"
 
+    # Filesystem storage for uploaded PDFs
+    PDF_STORAGE_DIR: str = "./storage/pdfs"
+    MAX_PDF_BYTES: int = 50 * 1024 * 1024
+
     # Server
     DEBUG: bool = True
+    LOG_LEVEL: str = "INFO"
 
     # LLM Settings
     GEMINI_MODEL: str = "gemini-2.5-flash"
+    LLM_CONCURRENCY: int = 4
+    # Input budget for extraction, in tokens. Gemini 2.5 Flash accepts
+    # ~1M tokens of context; the default stays well below that to bound
+    # per-contract cost while fitting any realistic contract whole.
+    EXTRACTION_INPUT_TOKENS: int = 100_000
 
     class Config:
         env_file = "../.env"
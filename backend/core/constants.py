@@ -1,5 +1,9 @@
 from enum import Enum
 
+# Version of the extraction prompt. Bump this whenever the prompt changes so
+# cached LLM results keyed on it are invalidated.
+PROMPT_VERSION = "v1"
+
 
 class ContractStatus(str, Enum):
     """Status of a contract in the audit pipeline."""
@@ -0,0 +1,32 @@
+"""
+Time-ordered UUID generation (UUIDv7, RFC 9562).
+
+Random uuid4 primary keys scatter inserts across the whole B-tree; a
+UUIDv7 leads with a millisecond timestamp so consecutive inserts land on
+neighbouring index pages.
+"""
+
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a UUIDv7: 48-bit unix-ms timestamp followed by random bits."""
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand_a = int.from_bytes(os.urandom(2), "big") & 0x0FFF
+    rand_b = int.from_bytes(os.urandom(8), "big") & 0x3FFFFFFFFFFFFFFF
+
+    value = (
+        ((timestamp_ms & 0xFFFFFFFFFFFF) << 80)  # unix_ts_ms
+        | (0x7 << 76)                            # version
+        | (rand_a << 64)                         # rand_a
+        | (0x2 << 62)                            # variant
+        | rand_b                                 # rand_b
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_str() -> str:
+    """UUIDv7 as the canonical 36-char string used for primary keys."""
+    return str(uuid7())
@@ -1,19 +1,55 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
+import logging
+import time
 
 from core.config import settings
 from db.base import Base
 
-# Create engine - SQLite with check_same_thread=False for async compatibility
+logger = logging.getLogger(__name__)
+
+# Queries slower than this are logged with their statement
+SLOW_QUERY_THRESHOLD_MS = 100
+
+_is_sqlite = "sqlite" in settings.DATABASE_URL
+
+# Create engine - SQLite with check_same_thread=False for async compatibility.
+# SQL echo is kept off regardless of DEBUG: logging every statement is a
+# significant hidden cost; slow queries are surfaced by the timing hook below.
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG,
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    echo=False,
+    insertmanyvalues_page_size=500,
+    # SQLite ignores pool sizing; real databases get a pool that survives
+    # concurrent upload load without connection-wait stalls
+    **({} if _is_sqlite else {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        "pool_recycle": 3600,
+    }),
 )
 
+
+@event.listens_for(engine, "before_cursor_execute")
+def _query_timer_start(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _query_timer_end(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    if elapsed_ms > SLOW_QUERY_THRESHOLD_MS:
+        logger.warning("Slow query (%.0f ms): %s", elapsed_ms, statement)
+
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps attributes usable after commit, so building
+# a response from a just-committed row costs no extra SELECT
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 
 def create_tables():
@@ -1,10 +1,24 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import logging
 
 from api.router import api_router
 from db.session import create_tables
 from core.config import settings
+from services.extraction_chain import get_extraction_chain
+from services.validation_agent import get_validation_agent
+
+logging.basicConfig(level=settings.LOG_LEVEL)
+
+# Use uvloop where available: the API is I/O-bound (LLM HTTP calls, DB,
+# uploads) so a faster event loop lowers latency on every endpoint
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 
 @asynccontextmanager
@@ -13,6 +27,22 @@ async def lifespan(app: FastAPI):
     # Startup: Create database tables
     create_tables()
     print("Database tables created")
+
+    # Build the LLM services once: constructor cost (client setup, prompt
+    # parsing) is paid at startup and connections to the provider are reused
+    # across requests instead of re-established per call. A misconfigured
+    # LLM (e.g. missing GEMINI_API_KEY) must not take down the non-LLM
+    # endpoints, so failure here just logs and defers to lazy construction
+    try:
+        app.state.extraction_chain = get_extraction_chain()
+        app.state.validation_agent = get_validation_agent()
+    except Exception:
+        logging.getLogger(__name__).warning(
+            "LLM services could not be built at startup; "
+            "audit endpoints will fail until the LLM is configured",
+            exc_info=True,
+        )
+
     yield
     # Shutdown
     print("Application shutting down")
@@ -23,7 +53,8 @@ app = FastAPI(
     title="AI Contract Auditor",
     description="API for auditing contracts using AI extraction and validation",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -1,9 +1,9 @@
-from sqlalchemy import Column, String, Text, JSON, DateTime, Boolean, Float, Integer, LargeBinary
+from sqlalchemy import Column, String, Text, JSON, DateTime, Boolean, Float, Integer, LargeBinary, Index
 from sqlalchemy.sql import func
-import uuid
 
 from db.base import Base
 from core.constants import ContractStatus
+from core.ids import uuid7_str
 
 
 class Contract(Base):
@@ -11,15 +11,25 @@ class Contract(Base):
 
     __tablename__ = "contracts"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Composite indexes matching the list_contracts filters + sort order
+    __table_args__ = (
+        Index("ix_contracts_status_created", "status", "created_at"),
+        Index("ix_contracts_review_created", "requires_human_review", "created_at"),
+    )
+
+    # Time-ordered UUIDv7 keeps inserts clustered in the primary index
+    id = Column(String(36), primary_key=True, default=uuid7_str)
 
     # File metadata
     file_name = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=True)
     file_mime_type = Column(String(100), default="application/pdf")
+    content_sha256 = Column(String(64), nullable=True, index=True)
 
-    # PDF binary storage
-    pdf_content = Column(LargeBinary, nullable=True)
+    # PDF storage: new rows store a filesystem path; pdf_content is kept
+    # only so contracts stored inline before the migration remain readable
+    pdf_path = Column(String(1000), nullable=True)
+    pdf_content = Column(LargeBinary, nullable=True)  # deprecated
 
     # Extracted content
     raw_text = Column(Text, nullable=True)
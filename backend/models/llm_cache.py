@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Text, JSON, DateTime, Float
+from sqlalchemy.sql import func
+
+from db.base import Base
+
+
+class LLMCacheEntry(Base):
+    """SQLAlchemy model for cached LLM extraction/validation results."""
+
+    __tablename__ = "llm_cache"
+
+    # Cache key: content hash + prompt version + model
+    input_hash = Column(String(64), primary_key=True)
+    prompt_version = Column(String(20), primary_key=True)
+    model_id = Column(String(100), primary_key=True)
+
+    # Cached pipeline output
+    extracted_json = Column(JSON, nullable=False)
+    confidence = Column(Float, nullable=False)
+    validation_json = Column(JSON, nullable=False)
+
+    # Expiry
+    created_at = Column(DateTime, server_default=func.now())
+    expires_at = Column(DateTime, nullable=False, index=True)
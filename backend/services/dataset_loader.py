@@ -9,28 +9,56 @@ The CUAD dataset contains:
 """
 
 from datasets import load_dataset
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional, Dict, Any
+import hashlib
+import logging
+import os
 import random
+import sqlite3
 import io
 
+logger = logging.getLogger(__name__)
+
+# Minimum page count before page extraction is fanned out to a process pool
+PARALLEL_PAGE_THRESHOLD = 8
+
+
+def _extract_page_text(args) -> str:
+    """
+    Worker for process-pool page extraction.
+
+    pdfplumber Page objects aren't picklable, so the worker re-opens the
+    PDF by path and extracts a single page.
+    """
+    pdf_path, page_index = args
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return pdf.pages[page_index].extract_text() or ""
+
 
 class CUADDatasetLoader:
     """Loader for the CUAD dataset from HuggingFace."""
 
     DATASET_NAME = "theatticusproject/cuad"
 
+    # Extracted text is cached here so it survives process restarts;
+    # parsing a 50-page contract costs seconds, a lookup microseconds
+    TEXT_CACHE_PATH = "./storage/cuad_cache.sqlite"
+
     def __init__(self):
         self._dataset = None
+        self._text_cache: Dict[int, str] = {}
 
     def load(self) -> None:
         """Load the CUAD dataset from HuggingFace."""
         if self._dataset is None:
-            print("Loading CUAD dataset from HuggingFace...")
+            logger.info("Loading CUAD dataset from HuggingFace...")
             self._dataset = load_dataset(
                 self.DATASET_NAME,
                 verification_mode="no_checks"
             )
-            print(f"Dataset loaded. Contracts: {len(self._dataset['train'])}")
+            logger.info("Dataset loaded. Contracts: %d", len(self._dataset['train']))
 
     @property
     def dataset(self):
@@ -39,16 +67,93 @@ class CUADDatasetLoader:
             self.load()
         return self._dataset
 
+    def _dataset_version(self) -> str:
+        """Version string used to invalidate cached text on dataset updates."""
+        try:
+            return str(self.dataset['train'].info.version)
+        except Exception:
+            return "unknown"
+
+    def _text_cache_conn(self) -> sqlite3.Connection:
+        """Open (and initialize) the on-disk text cache."""
+        os.makedirs(os.path.dirname(self.TEXT_CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(self.TEXT_CACHE_PATH)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cuad_text_cache ("
+            " dataset_version TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " text TEXT NOT NULL,"
+            " sha256 TEXT NOT NULL,"
+            " PRIMARY KEY (dataset_version, idx))"
+        )
+        return conn
+
+    def _extract_text_for_idx(self, idx: int) -> str:
+        """
+        Get the extracted text of contract `idx`, caching in memory and on
+        disk so each contract is parsed at most once per dataset version.
+        """
+        cached = self._text_cache.get(idx)
+        if cached is not None:
+            return cached
+
+        version = self._dataset_version()
+        try:
+            with self._text_cache_conn() as conn:
+                row = conn.execute(
+                    "SELECT text FROM cuad_text_cache"
+                    " WHERE dataset_version = ? AND idx = ?",
+                    (version, idx)
+                ).fetchone()
+                if row is not None:
+                    self._text_cache[idx] = row[0]
+                    return row[0]
+        except sqlite3.Error as e:
+            logger.debug("Text cache read failed: %s", e)
+
+        text = self._extract_text_from_pdf(self.dataset['train'][idx]['pdf'])
+
+        self._text_cache[idx] = text
+        try:
+            with self._text_cache_conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cuad_text_cache"
+                    " (dataset_version, idx, text, sha256) VALUES (?, ?, ?, ?)",
+                    (version, idx, text, hashlib.sha256(text.encode('utf-8')).hexdigest())
+                )
+        except sqlite3.Error as e:
+            logger.debug("Text cache write failed: %s", e)
+
+        return text
+
     def _extract_text_from_pdf(self, pdf_obj) -> str:
         """Extract text from a pdfplumber PDF object."""
         text_parts = []
         try:
-            for page in pdf_obj.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+            num_pages = len(pdf_obj.pages)
+            pdf_path = getattr(getattr(pdf_obj, 'stream', None), 'name', None)
+
+            if (
+                num_pages >= PARALLEL_PAGE_THRESHOLD
+                and pdf_path
+                and os.path.exists(pdf_path)
+            ):
+                # Long document backed by a real file: extract pages in
+                # parallel, each worker re-opening the PDF by path
+                max_workers = min(os.cpu_count() or 1, 4)
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    page_texts = list(executor.map(
+                        _extract_page_text,
+                        [(pdf_path, i) for i in range(num_pages)]
+                    ))
+                text_parts = [t for t in page_texts if t]
+            else:
+                for page in pdf_obj.pages:
+                    page_text = page.extract_text()
+                    if page_text:
+                        text_parts.append(page_text)
         except Exception as e:
-            print(f"Error extracting PDF text: {e}")
+            logger.warning("Error extracting PDF text: %s", e)
         return "\n\n".join(text_parts)
 
     def _get_pdf_bytes(self, pdf_obj) -> Optional[bytes]:
@@ -59,7 +164,7 @@ class CUADDatasetLoader:
                 pdf_obj.stream.seek(0)
                 return pdf_obj.stream.read()
         except Exception as e:
-            print(f"Error extracting PDF bytes: {e}")
+            logger.warning("Error extracting PDF bytes: %s", e)
         return None
 
     def get_sample_contracts(self, n: int = 5, seed: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -88,8 +193,8 @@ class CUADDatasetLoader:
                 entry = train_data[idx]
                 pdf_obj = entry['pdf']
 
-                # Extract text from PDF
-                text = self._extract_text_from_pdf(pdf_obj)
+                # Extract text from PDF (cached per idx)
+                text = self._extract_text_for_idx(idx)
 
                 # Extract PDF bytes
                 pdf_bytes = self._get_pdf_bytes(pdf_obj)
@@ -102,7 +207,7 @@ class CUADDatasetLoader:
                         'index': idx,
                     })
             except Exception as e:
-                print(f"Error processing contract {idx}: {e}")
+                logger.warning("Error processing contract %d: %s", idx, e)
                 continue
 
         return contracts
@@ -123,9 +228,7 @@ class CUADDatasetLoader:
             return None
 
         try:
-            entry = train_data[index]
-            pdf_obj = entry['pdf']
-            text = self._extract_text_from_pdf(pdf_obj)
+            text = self._extract_text_for_idx(index)
 
             return {
                 'title': f"CUAD_Contract_{index}",
@@ -133,7 +236,7 @@ class CUADDatasetLoader:
                 'index': index,
             }
         except Exception as e:
-            print(f"Error getting contract {index}: {e}")
+            logger.warning("Error getting contract %d: %s", index, e)
             return None
 
     def get_statistics(self) -> Dict[str, Any]:
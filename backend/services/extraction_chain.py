@@ -1,12 +1,16 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Optional
-import json
+from functools import lru_cache
+from collections import OrderedDict
+import asyncio
+import hashlib
+import threading
 
 from core.config import settings
 from api.schemas.contract import ExtractedDataSchema, PartySchema
+from services.llm_client import get_llm
 
 
 class LLMExtractionResult(BaseModel):
@@ -21,21 +25,7 @@ class LLMExtractionResult(BaseModel):
     confidence: float = Field(0.8, ge=0, le=1, description="Extraction confidence")
 
 
-class ExtractionChain:
-    """LangChain-based extraction service using Gemini."""
-
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.GEMINI_MODEL,
-            google_api_key=settings.GEMINI_API_KEY,
-            temperature=0,  # Deterministic for extraction
-        )
-        self.parser = PydanticOutputParser(pydantic_object=LLMExtractionResult)
-
-    def _build_prompt(self) -> ChatPromptTemplate:
-        """Build the extraction prompt template."""
-        return ChatPromptTemplate.from_messages([
-            ("system", """You are an expert legal analyst specializing in contract information extraction.
+_EXTRACTION_SYSTEM_BASE = """You are an expert legal analyst specializing in contract information extraction.
 Your task is to extract structured data from the provided contract text.
 
 IMPORTANT INSTRUCTIONS:
@@ -79,14 +69,63 @@ IMPORTANT INSTRUCTIONS:
 
 {format_instructions}
 
-RESPOND ONLY WITH THE JSON. NO ADDITIONAL TEXT."""),
-            ("human", """Extract structured information from this contract:
+RESPOND ONLY WITH THE JSON. NO ADDITIONAL TEXT."""
+
+# The format instructions derive from a schema that never changes, so
+# they are inlined once at import (braces escaped for the prompt
+# template) instead of interpolated per call — the system message stays
+# a fixed literal and only {contract_text} varies per request
+_FORMAT_INSTRUCTIONS = PydanticOutputParser(
+    pydantic_object=LLMExtractionResult
+).get_format_instructions()
+
+EXTRACTION_SYSTEM_TEMPLATE = _EXTRACTION_SYSTEM_BASE.format(
+    format_instructions=_FORMAT_INSTRUCTIONS.replace("{", "{{").replace("}", "}}")
+)
+
+# Conservative chars-per-token ratio for sizing the truncation budget;
+# legal English/Spanish averages closer to 4 chars per token
+_CHARS_PER_TOKEN = 3
+
+# In-process LRU entries for the exact-match extraction cache. Sized for
+# boilerplate-heavy workloads (template MSAs, re-submitted contracts)
+# where identical text recurs within one process lifetime.
+_RESULT_CACHE_MAX_ENTRIES = 1024
+
+EXTRACTION_HUMAN_TEMPLATE = """Extract structured information from this contract:
 
 --- CONTRACT START ---
 {contract_text}
---- CONTRACT END ---
+--- CONTRACT END ---"""
+
+
+class ExtractionChain:
+    """LangChain-based extraction service using Gemini."""
+
+    def __init__(self):
+        # Output shape is enforced by Gemini's structured-output mode:
+        # the model emits pure schema-conformant JSON with no fences or
+        # preamble
+        self._prompt = self._build_prompt()
+        self.llm = get_llm(
+            response_schema=LLMExtractionResult,
+            max_output_tokens=1024,
+        )
+        self._chain = self._prompt | self.llm
+
+        # Background loop for extract_sync, started on first use
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_loop_lock = threading.Lock()
 
-Return the JSON with extracted data:""")
+        # Exact-match result cache: hash of contract text -> (dumped
+        # schema, confidence). A hit skips the Gemini call entirely.
+        self._result_cache: "OrderedDict[str, tuple[dict, float]]" = OrderedDict()
+
+    def _build_prompt(self) -> ChatPromptTemplate:
+        """Build the extraction prompt template."""
+        return ChatPromptTemplate.from_messages([
+            ("system", EXTRACTION_SYSTEM_TEMPLATE),
+            ("human", EXTRACTION_HUMAN_TEMPLATE)
         ])
 
     async def extract(self, contract_text: str) -> tuple[ExtractedDataSchema, float]:
@@ -99,21 +138,29 @@ Return the JSON with extracted data:""")
         Returns:
             Tuple of (ExtractedDataSchema, confidence_score)
         """
-        prompt = self._build_prompt()
-        format_instructions = self.parser.get_format_instructions()
-
-        # Truncate if too long (Gemini has token limits)
-        max_chars = 30000  # Safe limit for context
+        # Truncate against the model's token budget rather than a fixed
+        # 30k characters, which cut off most contracts long before the
+        # context window was anywhere near full. Gemini exposes no local
+        # tokenizer and count_tokens is a network round-trip, so the
+        # budget is converted with a conservative chars-per-token ratio.
+        max_chars = settings.EXTRACTION_INPUT_TOKENS * _CHARS_PER_TOKEN
         if len(contract_text) > max_chars:
             contract_text = contract_text[:max_chars] + "\n\n[... TRUNCATED ...]"
 
-        try:
-            # Create and invoke the chain
-            chain = prompt | self.llm
+        # Boilerplate contracts recur byte-for-byte; answer repeats from
+        # the in-process cache without touching the LLM
+        cache_key = hashlib.blake2b(
+            contract_text.encode(), digest_size=16
+        ).hexdigest()
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+            dumped, confidence = cached
+            return ExtractedDataSchema.model_validate(dumped), confidence
 
-            result = await chain.ainvoke({
-                "contract_text": contract_text,
-                "format_instructions": format_instructions
+        try:
+            result = await self._chain.ainvoke({
+                "contract_text": contract_text
             })
 
             # Parse the response
@@ -121,11 +168,19 @@ Return the JSON with extracted data:""")
 
             # Try to extract JSON from the response
             parsed = self._parse_response(response_text)
-
-            # Convert to our schema
-            extracted_data = ExtractedDataSchema(
+            if parsed is None:
+                import logging
+                logging.error("LLM extraction response did not parse as JSON")
+                return ExtractedDataSchema(risk_score=50), 0.0
+
+            # Convert to our schema. The fields were already validated as
+            # LLMExtractionResult, so re-wrapping skips a second full
+            # validation pass via model_construct.
+            extracted_data = ExtractedDataSchema.model_construct(
                 parties=[
-                    PartySchema(name=p.get("name", "Unknown"), role=p.get("role"))
+                    PartySchema.model_construct(
+                        name=p.get("name", "Unknown"), role=p.get("role")
+                    )
                     for p in parsed.parties
                 ],
                 effective_date=parsed.effective_date,
@@ -135,6 +190,14 @@ Return the JSON with extracted data:""")
                 risk_score=parsed.risk_score
             )
 
+            # Only successful extractions are cached; the error path below
+            # returns a low-confidence default that should be retried
+            self._result_cache[cache_key] = (
+                extracted_data.model_dump(), parsed.confidence
+            )
+            if len(self._result_cache) > _RESULT_CACHE_MAX_ENTRIES:
+                self._result_cache.popitem(last=False)
+
             return extracted_data, parsed.confidence
 
         except Exception as e:
@@ -144,36 +207,86 @@ Return the JSON with extracted data:""")
             # Return default with low confidence on error
             return ExtractedDataSchema(risk_score=50), 0.0
 
-    def _parse_response(self, response_text: str) -> LLMExtractionResult:
-        """Parse the LLM response into structured data."""
+    def _parse_response(self, response_text: str) -> Optional[LLMExtractionResult]:
+        """Parse the LLM's structured-output JSON into the result model.
+
+        model_validate_json decodes and validates in one pass inside
+        pydantic-core (Rust), skipping the intermediate Python dict that
+        json.loads would build for multi-KB responses.
+
+        Returns None when the response does not parse: a defaulted
+        result here would masquerade as a confident extraction, and the
+        caller must not cache it.
+        """
         try:
-            # Try to find JSON in the response
-            text = response_text.strip()
-
-            # Handle markdown code blocks
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0]
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0]
-
-            # Parse JSON
-            data = json.loads(text)
-            return LLMExtractionResult(**data)
-        except json.JSONDecodeError:
-            # Try to parse with the Pydantic parser
-            try:
-                return self.parser.parse(response_text)
-            except Exception:
-                return LLMExtractionResult()
+            return LLMExtractionResult.model_validate_json(response_text)
+        except ValidationError:
+            # Repair pass: slice out the outermost JSON object in case
+            # the model wrapped it in stray text despite structured mode
+            start = response_text.find("{")
+            end = response_text.rfind("}")
+            if 0 <= start < end:
+                try:
+                    return LLMExtractionResult.model_validate_json(
+                        response_text[start:end + 1]
+                    )
+                except ValidationError:
+                    pass
+            return None
+
+    async def extract_many(
+        self,
+        texts: List[str]
+    ) -> List[tuple[ExtractedDataSchema, float]]:
+        """
+        Extract structured data from several contracts concurrently.
+
+        The per-contract calls are network-bound, so firing them together
+        overlaps the round-trips to Gemini; concurrency is bounded by the
+        LLM_CONCURRENCY setting to respect provider rate limits.
+
+        Args:
+            texts: Raw contract texts
+
+        Returns:
+            One (ExtractedDataSchema, confidence_score) tuple per text,
+            in input order
+        """
+        sem = asyncio.Semaphore(settings.LLM_CONCURRENCY)
+
+        async def _one(text: str):
+            async with sem:
+                return await self.extract(text)
+
+        return await asyncio.gather(*(_one(text) for text in texts))
+
+    def _get_sync_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Lazily start a long-lived event loop on a background thread.
+
+        Reusing one loop across extract_sync calls keeps the underlying
+        HTTP/2 connections to Gemini alive instead of tearing the
+        transport down with a throwaway loop on every call.
+        """
+        with self._sync_loop_lock:
+            if self._sync_loop is None:
+                self._sync_loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._sync_loop.run_forever,
+                    name="extraction-chain-sync-loop",
+                    daemon=True,
+                ).start()
+            return self._sync_loop
 
     def extract_sync(self, contract_text: str) -> tuple[ExtractedDataSchema, float]:
         """Synchronous version of extract for non-async contexts."""
-        import asyncio
+        future = asyncio.run_coroutine_threadsafe(
+            self.extract(contract_text), self._get_sync_loop()
+        )
+        return future.result()
 
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
 
-        return loop.run_until_complete(self.extract(contract_text))
+@lru_cache()
+def get_extraction_chain() -> ExtractionChain:
+    """Get the singleton extraction chain instance."""
+    return ExtractionChain()
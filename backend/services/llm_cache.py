@@ -0,0 +1,98 @@
+"""
+Content-addressable cache for LLM pipeline results.
+
+Extraction and validation are the dominant latency/cost path (seconds per
+call, paid API). Re-submissions of the same content are frequent enough that
+caching by content hash lets them return in milliseconds without spending
+LLM tokens. Entries are keyed by (model, prompt version, sha256 of the
+input), so changing the prompt or model invalidates old entries naturally.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional, Tuple, Dict, Any
+from sqlalchemy.orm import Session
+
+from models.llm_cache import LLMCacheEntry
+
+# How long a cache entry stays valid
+CACHE_TTL_DAYS = 7
+
+# Key is (model_id, prompt_version, input_hash)
+CacheKey = Tuple[str, str, str]
+
+
+def get(db: Session, key: CacheKey) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached pipeline result.
+
+    Args:
+        db: Database session
+        key: (model_id, prompt_version, input_hash) tuple
+
+    Returns:
+        Dict with 'extracted_data', 'confidence' and 'validation' on hit,
+        None on miss or if the entry has expired.
+    """
+    model_id, prompt_version, input_hash = key
+
+    entry = db.query(LLMCacheEntry).filter(
+        LLMCacheEntry.input_hash == input_hash,
+        LLMCacheEntry.prompt_version == prompt_version,
+        LLMCacheEntry.model_id == model_id,
+    ).first()
+
+    if entry is None:
+        return None
+
+    if entry.expires_at is not None and entry.expires_at < datetime.utcnow():
+        # Expired: drop the stale entry and treat as a miss
+        db.delete(entry)
+        db.commit()
+        return None
+
+    return {
+        "extracted_data": entry.extracted_json,
+        "confidence": entry.confidence,
+        "validation": entry.validation_json,
+    }
+
+
+def set(
+    db: Session,
+    key: CacheKey,
+    extracted_data: Dict[str, Any],
+    confidence: float,
+    validation: Dict[str, Any],
+) -> None:
+    """
+    Store a pipeline result in the cache.
+
+    Args:
+        db: Database session
+        key: (model_id, prompt_version, input_hash) tuple
+        extracted_data: Serialized ExtractedDataSchema
+        confidence: Extraction confidence score
+        validation: Serialized ValidationResult
+    """
+    model_id, prompt_version, input_hash = key
+
+    entry = db.query(LLMCacheEntry).filter(
+        LLMCacheEntry.input_hash == input_hash,
+        LLMCacheEntry.prompt_version == prompt_version,
+        LLMCacheEntry.model_id == model_id,
+    ).first()
+
+    if entry is None:
+        entry = LLMCacheEntry(
+            input_hash=input_hash,
+            prompt_version=prompt_version,
+            model_id=model_id,
+        )
+        db.add(entry)
+
+    entry.extracted_json = extracted_data
+    entry.confidence = confidence
+    entry.validation_json = validation
+    entry.expires_at = datetime.utcnow() + timedelta(days=CACHE_TTL_DAYS)
+
+    db.commit()
@@ -0,0 +1,53 @@
+"""
+Shared Gemini chat client.
+
+Every ChatGoogleGenerativeAI instance carries its own gRPC channel and
+auth state, so constructing one per service (or per request) reopens
+TLS and redoes the HTTP/2 handshake. Memoizing the client here lets all
+chains reuse one warm channel for the lifetime of the process.
+"""
+
+from functools import lru_cache
+from typing import Optional, Type
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import BaseModel
+
+from core.config import settings
+
+
+@lru_cache(maxsize=None)
+def get_llm(
+    response_schema: Optional[Type[BaseModel]] = None,
+    max_output_tokens: Optional[int] = None,
+) -> ChatGoogleGenerativeAI:
+    """
+    Get a shared Gemini chat client.
+
+    Args:
+        response_schema: Pydantic model to enforce via Gemini's native
+            structured-output mode. The model then emits pure JSON
+            matching the schema — no markdown fences, no preamble — so
+            responses are shorter and parse without string munging.
+        max_output_tokens: Decode budget for the response. Latency scales
+            with generated tokens, so callers should size this to their
+            schema rather than accept the provider's large default.
+
+    Clients are memoized per argument combination, so each variant
+    reuses a single long-lived channel.
+    """
+    kwargs = dict(
+        model=settings.GEMINI_MODEL,
+        google_api_key=settings.GEMINI_API_KEY,
+        temperature=0,
+        n=1,  # one candidate: never pay decode time for alternatives
+    )
+    if max_output_tokens is not None:
+        kwargs["max_output_tokens"] = max_output_tokens
+    if response_schema is not None:
+        # These are first-class ChatGoogleGenerativeAI fields; arbitrary
+        # model_kwargs are NOT forwarded into the generation config by
+        # the integration and would be silently dropped
+        kwargs["response_mime_type"] = "application/json"
+        kwargs["response_schema"] = response_schema.model_json_schema()
+    return ChatGoogleGenerativeAI(**kwargs)
@@ -1,12 +1,56 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from typing import List, Optional
-from pydantic import BaseModel
-import json
+from pydantic import BaseModel, ValidationError
+from functools import lru_cache
+import asyncio
 import re
 
 from core.config import settings
 from api.schemas.contract import ExtractedDataSchema, ValidationIssue
+from services.llm_client import get_llm
+
+
+DURATION_SYSTEM_PROMPT = """You are an expert at interpreting contract duration terms.
+Analyze the duration and determine the number of COMPLETE months.
+
+RULES:
+- 1 year = 12 months
+- DO NOT round up partial periods to the next month
+- "two years" = 24 months
+- "two years and one day" = 24 months (but note there are extra days)
+- "one and a half years" = 18 months
+- Report if there are extra days/weeks beyond complete months
+
+Respond with JSON only:
+{{
+  "months": <integer number of complete months, or null if indefinite>,
+  "has_extra_days": <true if there are additional days beyond complete months>,
+  "reasoning": "<explanation>"
+}}"""
+
+DURATION_HUMAN_TEMPLATE = 'Analyze this duration: "{duration_text}"'
+
+
+# Word-to-number mapping for spelled-out durations
+_WORD_NUMS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20, "twenty-one": 21, "twenty-two": 22,
+    "twenty-three": 23, "twenty-four": 24, "twenty-five": 25,
+    "thirty": 30, "thirty-six": 36
+}
+
+# Compiled once at import: the fallback parser runs on every validation,
+# and per-call re.compile plus a ~30-word loop dominated its cost.
+# Longest alternatives first so "twenty-four" wins over "four".
+_SORTED_WORDS = sorted(_WORD_NUMS, key=len, reverse=True)
+_WORD_DURATION_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, _SORTED_WORDS)) + r")\s+(years?|months?)\b"
+)
+_NUM_DURATION_RE = re.compile(r"(\d+)\s*(years?|months?)\b")
+_EXTRA_DAYS_RE = re.compile(r"\b(?:and|y)\s*(one|a|un|una|\d+)\s*(?:days?|d[ií]as?)\b")
 
 
 class DurationParseResult(BaseModel):
@@ -36,6 +80,14 @@ class ValidationAgent:
     including partial periods (days/weeks). "24 months and 1 day" exceeds the limit.
     """
 
+    # One C-level case-insensitive search replaces lowercasing the field
+    # and scanning five substrings per contract; accented spellings are
+    # covered alongside the ASCII forms
+    _CHILE_RE = re.compile(
+        r"\b(chile|santiago|valpara[ií]so|concepci[oó]n|chilean|chilen[oa])\b",
+        re.IGNORECASE,
+    )
+
     BUSINESS_RULES = [
         {
             "id": "duration_24_months",
@@ -55,11 +107,21 @@ class ValidationAgent:
     ]
 
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.GEMINI_MODEL,
-            google_api_key=settings.GEMINI_API_KEY,
-            temperature=0,
+        # Gemini's structured-output mode pins the response to the
+        # DurationParseResult shape
+        self._duration_prompt = self._build_duration_prompt()
+        self.llm = get_llm(
+            response_schema=DurationParseResult,
+            max_output_tokens=256,
         )
+        self._duration_chain = self._duration_prompt | self.llm
+
+    def _build_duration_prompt(self) -> ChatPromptTemplate:
+        """Build the duration-analysis prompt template."""
+        return ChatPromptTemplate.from_messages([
+            ("system", DURATION_SYSTEM_PROMPT),
+            ("human", DURATION_HUMAN_TEMPLATE)
+        ])
 
     async def parse_duration_text(self, duration_text: str) -> DurationParseResult:
         """
@@ -71,115 +133,62 @@ class ValidationAgent:
         - "twenty-five months" -> 25 months, EXCEEDS
         - "eighteen months" -> 18 months, does NOT exceed
         """
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert at interpreting contract duration terms.
-Analyze the duration and determine the number of COMPLETE months.
-
-RULES:
-- 1 year = 12 months
-- DO NOT round up partial periods to the next month
-- "two years" = 24 months
-- "two years and one day" = 24 months (but note there are extra days)
-- "one and a half years" = 18 months
-- Report if there are extra days/weeks beyond complete months
-
-Respond with JSON only:
-{{
-  "months": <integer number of complete months, or null if indefinite>,
-  "has_extra_days": <true if there are additional days beyond complete months>,
-  "reasoning": "<explanation>"
-}}"""),
-            ("human", "Analyze this duration: \"{duration_text}\"")
-        ])
-
         try:
-            chain = prompt | self.llm
-            result = await chain.ainvoke({"duration_text": duration_text})
-
-            # Parse response
-            text = result.content.strip()
-            if "```" in text:
-                text = text.split("```")[1].split("```")[0]
-                if text.startswith("json"):
-                    text = text[4:]
-
-            data = json.loads(text)
-            return DurationParseResult(
-                months=data.get("months"),
-                has_extra_days=data.get("has_extra_days", False),
-                reasoning=data.get("reasoning", "")
-            )
+            result = await self._duration_chain.ainvoke({"duration_text": duration_text})
+
+            # Decode + validate in one pass in pydantic-core, without an
+            # intermediate dict from json.loads
+            text = result.content
+            try:
+                return DurationParseResult.model_validate_json(text)
+            except ValidationError:
+                # Repair pass: slice out the outermost JSON object in
+                # case the model wrapped it in fences or stray text
+                start = text.find("{")
+                end = text.rfind("}")
+                if 0 <= start < end:
+                    return DurationParseResult.model_validate_json(
+                        text[start:end + 1]
+                    )
+                raise
         except Exception as e:
             # Fallback: try simple pattern matching
             return self._parse_duration_fallback(duration_text)
 
     def _parse_duration_fallback(self, text: str) -> DurationParseResult:
-        """Fallback duration parsing with regex patterns."""
+        """Fallback duration parsing with precompiled regex patterns."""
         text = text.lower().strip()
 
-        # Patterns for common formats
-        patterns = [
-            # "X years" or "X year"
-            (r"(\d+)\s*years?", lambda m: int(m.group(1)) * 12),
-            # "X months" or "X month"
-            (r"(\d+)\s*months?", lambda m: int(m.group(1))),
-            # "X years and Y months"
-            (r"(\d+)\s*years?\s*(?:and\s*)?(\d+)\s*months?",
-             lambda m: int(m.group(1)) * 12 + int(m.group(2))),
-        ]
-
-        # Word to number mapping
-        word_nums = {
-            "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
-            "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
-            "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
-            "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
-            "nineteen": 19, "twenty": 20, "twenty-one": 21, "twenty-two": 22,
-            "twenty-three": 23, "twenty-four": 24, "twenty-five": 25,
-            "thirty": 30, "thirty-six": 36
-        }
-
-        # Try numeric patterns first
-        for pattern, converter in patterns:
-            match = re.search(pattern, text)
-            if match:
-                months = converter(match)
-                # Check for "and one day" or similar -> mark as has_extra_days (DON'T add months)
-                has_extra = bool(re.search(r"and\s*(one|a|\d+)\s*days?", text))
-                return DurationParseResult(
-                    months=months,
-                    has_extra_days=has_extra,
-                    reasoning=f"Pattern match: {pattern}" + (" (with extra days)" if has_extra else "")
-                )
-
-        # Try word-based patterns with regex to match word directly before year/month
-        # Sort by length descending to match "twenty-four" before "four"
-        sorted_words = sorted(word_nums.keys(), key=len, reverse=True)
-
-        for word in sorted_words:
-            num = word_nums[word]
-            # Match word directly followed by year(s)
-            year_match = re.search(rf"\b{re.escape(word)}\s+years?\b", text)
-            if year_match:
-                months = num * 12
-                has_extra = bool(re.search(r"\band\s+(one|a|\d+)\s+days?\b", text))
-                return DurationParseResult(
-                    months=months,
-                    has_extra_days=has_extra,
-                    reasoning=f"Word match: {word} years" + (" (with extra days)" if has_extra else "")
-                )
-
-            # Match word directly followed by month(s)
-            month_match = re.search(rf"\b{re.escape(word)}\s+months?\b", text)
-            if month_match:
-                has_extra = bool(re.search(r"\band\s+(one|a|\d+)\s+days?\b", text))
-                return DurationParseResult(
-                    months=num,
-                    has_extra_days=has_extra,
-                    reasoning=f"Word match: {word} months" + (" (with extra days)" if has_extra else "")
-                )
-
-        return DurationParseResult(months=None, reasoning="Could not parse duration")
+        has_extra = bool(_EXTRA_DAYS_RE.search(text))
+        extra_note = " (with extra days)" if has_extra else ""
+
+        # Numeric amounts: "2 years", "18 months"
+        match = _NUM_DURATION_RE.search(text)
+        if match:
+            amount = int(match.group(1))
+            months = amount * 12 if match.group(2).startswith("year") else amount
+            return DurationParseResult(
+                months=months,
+                has_extra_days=has_extra,
+                reasoning=f"Pattern match: {match.group(0)}{extra_note}"
+            )
+
+        # Spelled-out amounts: "two years", "eighteen months"
+        match = _WORD_DURATION_RE.search(text)
+        if match:
+            num = _WORD_NUMS[match.group(1)]
+            months = num * 12 if match.group(2).startswith("year") else num
+            return DurationParseResult(
+                months=months,
+                has_extra_days=has_extra,
+                reasoning=f"Word match: {match.group(0)}{extra_note}"
+            )
+
+        return DurationParseResult(
+            months=None,
+            has_extra_days=has_extra,
+            reasoning="Could not parse duration"
+        )
 
     async def validate(self, extracted_data: ExtractedDataSchema) -> ValidationResult:
         """
@@ -227,6 +236,24 @@ Respond with JSON only:
             review_reasons=review_reasons
         )
 
+    async def validate_many(
+        self,
+        extracted: List[ExtractedDataSchema]
+    ) -> List[ValidationResult]:
+        """
+        Validate several extractions concurrently.
+
+        Only durations that need the LLM incur network calls; those are
+        overlapped, bounded by the LLM_CONCURRENCY setting.
+        """
+        sem = asyncio.Semaphore(settings.LLM_CONCURRENCY)
+
+        async def _one(data: ExtractedDataSchema):
+            async with sem:
+                return await self.validate(data)
+
+        return await asyncio.gather(*(_one(data) for data in extracted))
+
     async def _check_duration_rule(
         self,
         data: ExtractedDataSchema
@@ -240,9 +267,13 @@ Respond with JSON only:
         duration_months = data.contract_duration_months
         has_extra_days = False
 
-        # If we have raw text but no parsed months, try to parse
+        # If we have raw text but no parsed months, try to parse.
+        # The deterministic fallback covers most real-world phrasings in
+        # microseconds; only text it cannot parse pays for a Gemini call.
         if data.contract_duration_raw:
-            parse_result = await self.parse_duration_text(data.contract_duration_raw)
+            parse_result = self._parse_duration_fallback(data.contract_duration_raw)
+            if parse_result.months is None:
+                parse_result = await self.parse_duration_text(data.contract_duration_raw)
             if duration_months is None:
                 duration_months = parse_result.months
             has_extra_days = parse_result.has_extra_days
@@ -277,12 +308,7 @@ Respond with JSON only:
         if not data.jurisdiction:
             return None
 
-        jurisdiction_lower = data.jurisdiction.lower()
-        chile_indicators = ["chile", "santiago", "valparaiso", "concepcion", "chilean"]
-
-        is_chile = any(ind in jurisdiction_lower for ind in chile_indicators)
-
-        if not is_chile:
+        if not self._CHILE_RE.search(data.jurisdiction):
             return ValidationIssue(
                 field="jurisdiction",
                 rule="jurisdiction_not_chile",
@@ -308,3 +334,9 @@ Respond with JSON only:
             )
 
         return None
+
+
+@lru_cache()
+def get_validation_agent() -> ValidationAgent:
+    """Get the singleton validation agent instance."""
+    return ValidationAgent()